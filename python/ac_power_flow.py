@@ -46,7 +46,10 @@ print("RUNNING AC POWER FLOW...")
 print("="*60)
 
 # Запускаем AC Power Flow (не linear!)
-network.pf()  # Это AC PF, не DC!
+# Начальное приближение Ньютона — решение DC PF (|V| = 1, θ = θ_dc)
+# вместо плоского старта: меньше итераций и надёжнее сходимость
+network.lpf()
+network.pf(use_seed=True)  # Это AC PF, не DC!
 
 print("\n✓ AC Power Flow completed!")
 
@@ -3,12 +3,26 @@ Benchmark: Python/PyPSA — DC Power Flow & LOPF
 Запускай рядом с julia/benchmark.jl для сравнения скоростей.
 """
 import numpy as np
+import pandas as pd
 import pypsa
+from scipy.sparse import coo_matrix, csc_matrix
+from scipy.sparse.linalg import splu, spsolve
 import time
-import statistics
 import csv
+import functools
+import gc
+import os
 import warnings
 import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba не обязателен: без него B собирается через scipy COO
+    HAVE_NUMBA = False
 
 # Убираем лишние предупреждения PyPSA из вывода
 warnings.filterwarnings("ignore")
@@ -19,132 +33,466 @@ logging.disable(logging.CRITICAL)
 #  Генератор сети (та же логика, что и в julia/benchmark.jl)
 # ----------------------------------------------------------------
 def generate_network(n_buses, seed=42):
+    """
+    Данные сети в виде массивов (SoA, узлы нумеруются с 1):
+    lines = (bus0, bus1, x), generators = (bus, p_max), loads = (bus, p_set).
+    """
     rng = np.random.default_rng(seed)
 
-    lines = []
     # Spanning tree
-    for i in range(1, n_buses):
-        x = 0.05 + rng.random() * 0.45
-        lines.append((i, i + 1, x))
+    tree = np.arange(1, n_buses, dtype=np.int32)
+    x_tree = 0.05 + rng.random(n_buses - 1) * 0.45
     # Дополнительные рёбра
-    for _ in range(max(1, n_buses // 3)):
-        u = int(rng.integers(1, n_buses))
-        v = int(rng.integers(u + 1, n_buses + 1))
-        x = 0.05 + rng.random() * 0.45
-        lines.append((u, v, x))
-
-    loads = {}
-    total_load = 0.0
-    for bus in range(2, n_buses + 1):
-        if rng.random() > 0.3:
-            p = 50.0 + rng.random() * 450.0
-            loads[bus] = p
-            total_load += p
-    if not loads:
-        loads[2] = 200.0
-        total_load = 200.0
-
-    generators = {1: total_load * 1.1}
-    for bus in range(2, n_buses + 1, 4):
-        generators[bus] = loads.get(bus, 0.0) * 0.5 + 50.0
-
-    return n_buses, lines, generators, loads
+    k = max(1, n_buses // 3)
+    us = rng.integers(1, n_buses, size=k)
+    vs = rng.integers(us + 1, n_buses + 1)
+    x_extra = 0.05 + rng.random(k) * 0.45
+
+    bus0 = np.concatenate([tree, us]).astype(np.int32)
+    bus1 = np.concatenate([tree + 1, vs]).astype(np.int32)
+    x = np.concatenate([x_tree, x_extra])
+
+    # Нагрузки: ~70% узлов 2..n
+    mask = rng.random(n_buses - 1) > 0.3
+    ps = 50.0 + rng.random(n_buses - 1) * 450.0
+    load_bus = np.arange(2, n_buses + 1, dtype=np.int32)[mask]
+    load_p = ps[mask]
+    if len(load_bus) == 0:
+        load_bus = np.array([2], dtype=np.int32)
+        load_p = np.array([200.0])
+
+    # Slack-генератор на узле 1 и по генератору на каждом 4-м узле
+    p_at_bus = np.zeros(n_buses + 1)
+    p_at_bus[load_bus] = load_p
+    gen_bus = np.r_[1, np.arange(2, n_buses + 1, 4)].astype(np.int32)
+    gen_p = np.r_[load_p.sum() * 1.1, p_at_bus[gen_bus[1:]] * 0.5 + 50.0]
+
+    return n_buses, (bus0, bus1, x), (gen_bus, gen_p), (load_bus, load_p)
 
 
 # ----------------------------------------------------------------
 #  Создание PyPSA Network из наших данных
 # ----------------------------------------------------------------
+@functools.lru_cache(maxsize=None)
+def bus_names(n_buses):
+    """Имена узлов Bus1..BusN — одни на все сборки сети данного размера."""
+    names = np.char.add("Bus", np.arange(1, n_buses + 1).astype(str))
+    names.flags.writeable = False
+    return names
+
+
 def build_pypsa_network(n_buses, lines, generators, loads, line_capacity=1e6):
     n = pypsa.Network()
 
-    for bus in range(1, n_buses + 1):
-        n.add("Bus", f"Bus{bus}", v_nom=380.0)
+    # Все компоненты добавляем одним вызовом на тип (вместо n.add на элемент)
+    names = bus_names(n_buses)
+    n.add("Bus", names, v_nom=380.0)
 
-    for idx, (f, t, x) in enumerate(lines):
-        n.add("Line", f"L{idx}", bus0=f"Bus{f}", bus1=f"Bus{t}",
-              x=x, r=0.01, s_nom=line_capacity)
+    bus0, bus1, x = lines
+    n.add("Line", np.char.add("L", np.arange(len(x)).astype(str)),
+          bus0=names[bus0 - 1], bus1=names[bus1 - 1],
+          x=x, r=0.01, s_nom=line_capacity)
 
-    for bus, p_max in generators.items():
-        ctrl = "Slack" if bus == 1 else "PQ"
-        n.add("Generator", f"G{bus}", bus=f"Bus{bus}",
-              p_nom=p_max, marginal_cost=20.0, control=ctrl)
+    gen_bus, p_max = generators
+    n.add("Generator", np.char.add("G", gen_bus.astype(str)),
+          bus=names[gen_bus - 1], p_nom=p_max, marginal_cost=20.0,
+          control=np.where(gen_bus == 1, "Slack", "PQ"))
 
-    for bus, p in loads.items():
-        n.add("Load", f"Load{bus}", bus=f"Bus{bus}", p_set=p)
+    load_bus, p_set = loads
+    n.add("Load", np.char.add("Load", load_bus.astype(str)),
+          bus=names[load_bus - 1], p_set=p_set)
 
     return n
 
 
+def prepare_lpf(net):
+    """
+    Один полный net.lpf(): топология, зависимые величины, матрицы B/H
+    и выделение выходных таблиц *_t под текущие снэпшоты. Между повторами
+    всё это не меняется, и дальше можно вызывать net.lpf(skip_pre=True).
+    Без полного lpf() таблицы *_t не выделены, и каждый skip_pre-вызов
+    тратит основное время на их заполнение через pandas.
+    После set_snapshots prepare_lpf нужно вызвать заново.
+    """
+    net.lpf()
+    return net
+
+
+# ----------------------------------------------------------------
+#  Прямой разреженный DC PF без PyPSA:  B·θ = P
+# ----------------------------------------------------------------
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _build_B_csc(bus0, bus1, x, n_buses):
+        """
+        Массивы data/indices/indptr матрицы B за один проход по линиям.
+        Первый элемент каждого столбца — диагональ, дальше по одному
+        элементу -b на каждую инцидентную линию. B симметрична, поэтому
+        те же массивы годятся и как CSR, и как CSC.
+        """
+        n_lines = len(x)
+        indptr = np.zeros(n_buses + 1, dtype=np.int64)
+        for k in range(n_buses):
+            indptr[k + 1] = 1
+        for k in range(n_lines):
+            indptr[bus0[k] + 1] += 1
+            indptr[bus1[k] + 1] += 1
+        for k in range(n_buses):
+            indptr[k + 1] += indptr[k]
+
+        nnz = 2 * n_lines + n_buses
+        data = np.zeros(nnz)
+        indices = np.empty(nnz, dtype=np.int64)
+        pos = np.empty(n_buses, dtype=np.int64)
+        for k in range(n_buses):
+            indices[indptr[k]] = k
+            pos[k] = indptr[k] + 1
+
+        for k in range(n_lines):
+            i, j = bus0[k], bus1[k]
+            b = 1.0 / x[k]
+            data[indptr[i]] += b
+            data[indptr[j]] += b
+            data[pos[i]] = -b
+            indices[pos[i]] = j
+            pos[i] += 1
+            data[pos[j]] = -b
+            indices[pos[j]] = i
+            pos[j] += 1
+        return data, indices, indptr
+
+
+def build_B(bus0, bus1, x, n_buses):
+    """Матрица B (CSC) по линиям; с numba — JIT-ядро, иначе scipy COO."""
+    if HAVE_NUMBA:
+        return csc_matrix(_build_B_csc(bus0, bus1, x, n_buses),
+                          shape=(n_buses, n_buses))
+    b = 1.0 / x
+    return coo_matrix((np.r_[b, b, -b, -b],
+                       (np.r_[bus0, bus1, bus0, bus1], np.r_[bus0, bus1, bus1, bus0])),
+                      shape=(n_buses, n_buses)).tocsc()
+
+
+def dc_pf_fast(bus0, bus1, x, p_inj, slack=0):
+    """
+    bus0, bus1 — индексы узлов линий (с 0), x — реактансы (p.u.),
+    p_inj — инъекции по узлам. Возвращает θ с θ[slack] = 0.
+    """
+    n_buses = len(p_inj)
+    B = build_B(bus0, bus1, x, n_buses)
+
+    keep = np.arange(n_buses) != slack
+    theta = np.zeros(n_buses)
+    theta[keep] = splu(B[keep][:, keep], permc_spec="COLAMD").solve(p_inj[keep])
+    return theta
+
+
+def dc_pf_arrays(net):
+    """Входные массивы dc_pf_fast из таблиц PyPSA (после calculate_dependent_values)."""
+    buses = net.buses.index
+    bus0 = buses.get_indexer(net.lines.bus0)
+    bus1 = buses.get_indexer(net.lines.bus1)
+    x = net.lines.x_pu.values
+
+    # Инъекции как в lpf: p_set генераторов минус p_set нагрузок
+    p_inj = (np.bincount(buses.get_indexer(net.generators.bus),
+                         weights=net.generators.p_set.fillna(0).values, minlength=len(buses))
+             - np.bincount(buses.get_indexer(net.loads.bus),
+                           weights=net.loads.p_set.values, minlength=len(buses)))
+
+    slack_gen = net.generators.control == "Slack"
+    slack = buses.get_loc(net.generators.bus[slack_gen].iloc[0])
+    return bus0, bus1, x, p_inj, slack
+
+
+def injections_o(net):
+    """Инъекции в порядке sub_network.buses_o (slack — первый узел)."""
+    sub_network = net.sub_networks.obj.iloc[0]
+    p_inj = dc_pf_arrays(net)[3]
+    return p_inj[net.buses.index.get_indexer(sub_network.buses_o)]
+
+
+def factorize_B(net):
+    """
+    LU-разложение B[1:, 1:] из PyPSA (sub_network.B, после calculate_B_H)
+    и вектор инъекций без slack.
+    """
+    sub_network = net.sub_networks.obj.iloc[0]
+    p = injections_o(net)
+    return splu(sub_network.B[1:, 1:].tocsc(), permc_spec="COLAMD"), p[1:]
+
+
+def lpf_no_writeback(net, p):
+    """
+    Расчёт net.lpf(skip_pre=True) для одного снэпшота без записи
+    результатов в buses_t / lines_t: θ (в порядке buses_o) и потоки
+    по линиям возвращаются массивами. p — результат injections_o(net).
+    """
+    sub_network = net.sub_networks.obj.iloc[0]
+    theta = np.zeros(len(p))
+    theta[1:] = spsolve(sub_network.B[1:, 1:], p[1:])
+    return theta, sub_network.H @ theta
+
+
+def ptdf_matrix(net):
+    """
+    PTDF = H[:, 1:] · B[1:, 1:]^-1 (линии × узлы без slack) из B и H PyPSA.
+    B симметрична, поэтому PTDF^T = B^-1 · H^T — считаем через splu,
+    без плотного обращения. Потоки по линиям: PTDF @ p[1:].
+    """
+    sub_network = net.sub_networks.obj.iloc[0]
+    lu = splu(sub_network.B[1:, 1:].tocsc(), permc_spec="COLAMD")
+    return lu.solve(sub_network.H[:, 1:].T.toarray()).T
+
+
+# ----------------------------------------------------------------
+#  LOPF: повторное решение HiGHS с оптимального базиса
+# ----------------------------------------------------------------
+@contextmanager
+def suppress_stdout_fd():
+    """
+    Глушит stdout на уровне файлового дескриптора: баннер HiGHS печатается
+    из C++ при создании решателя, и redirect_stdout его не перехватывает.
+    """
+    sys.stdout.flush()
+    saved = os.dup(1)
+    try:
+        with open(os.devnull, "w") as devnull:
+            os.dup2(devnull.fileno(), 1)
+            yield
+    finally:
+        os.dup2(saved, 1)
+        os.close(saved)
+
+
+def highs_warm_start(net):
+    """
+    Строит модель linopy, передаёт её в highspy и решает один раз.
+    Возвращает (h, basis) — решатель и оптимальный базис для повторов.
+    """
+    model = net.optimize.create_model()
+    with suppress_stdout_fd():
+        h = model.to_highspy()
+    h.setOptionValue("output_flag", False)
+    h.run()
+    return h, h.getBasis()
+
+
+def resolve_warm(state):
+    h, basis = state
+    h.setBasis(basis)
+    h.run()
+
+
 # ----------------------------------------------------------------
 #  Замер времени
 # ----------------------------------------------------------------
-def time_median(func, n_runs):
-    times = []
-    for _ in range(n_runs):
-        t0 = time.perf_counter()
-        func()
-        times.append(time.perf_counter() - t0)
-    return statistics.median(times), min(times)
+MIN_SAMPLE_NS = 100_000   # вызовы быстрее 100 мкс замеряем пачками
 
 
-# ================================================================
-#  ОСНОВНОЙ БЕНЧМАРК
-# ================================================================
-print("=" * 70)
-print("BENCHMARK: Python/PyPSA — DC Power Flow & LOPF")
-print("=" * 70)
+def time_median(func, n_runs, setup=None):
+    """
+    Медиана и минимум времени func() по n_runs замерам (в секундах).
+    Если задан setup, он вызывается один раз вне замера,
+    а в замере выполняется func(state) с его результатом.
+    Первый вызов — прогрев (JIT, кэши) и не учитывается. Размер пачки k
+    выбирается по следующему, уже тёплому вызову: если он не быстрее
+    MIN_SAMPLE_NS, то k = 1 и он идёт первым замером, иначе k считается
+    по минимуму из трёх тёплых вызовов. Каждый замер — среднее по k
+    вызовам. Сборщик мусора на время замеров отключён.
+    """
+    if setup is not None:
+        state = setup()
+        call = lambda: func(state)
+    else:
+        call = func
+
+    gc.disable()
+    try:
+        call()
 
+        times = np.empty(n_runs, dtype=np.int64)
+        t0 = time.perf_counter_ns()
+        call()
+        dt = time.perf_counter_ns() - t0
+        if dt >= MIN_SAMPLE_NS:
+            k, times[0], first = 1, dt, 1
+        else:
+            for _ in range(2):
+                t0 = time.perf_counter_ns()
+                call()
+                dt = min(dt, time.perf_counter_ns() - t0)
+            k, first = MIN_SAMPLE_NS // max(dt, 1), 0
+
+        for i in range(first, n_runs):
+            t0 = time.perf_counter_ns()
+            for _ in range(k):
+                call()
+            times[i] = time.perf_counter_ns() - t0
+    finally:
+        gc.enable()
+    return float(np.median(times)) / k * 1e-9, float(times.min()) / k * 1e-9
+
+
+# ----------------------------------------------------------------
+#  Замеры для одного размера сети
+# ----------------------------------------------------------------
 DC_SIZES   = [3, 10, 50, 100, 500, 1000, 2000]
 LOPF_SIZES = [3, 10, 50, 100, 500]
 
-dc_results   = {}
-lopf_results = {}
+# Сеть для каждого размера генерируется один раз — DC и LOPF используют одну и ту же
+NETWORKS = {n: generate_network(n, seed=42) for n in sorted(set(DC_SIZES) | set(LOPF_SIZES))}
 
-# ── DC Power Flow (lpf) ─────────────────────────────────────────
-print("\n[DC POWER FLOW BENCHMARK]")
-print("-" * 70)
-print(f"{'Buses':<10} {'Median (ms)':>12} {'Min (ms)':>12} {'Lines':>10}")
-print("-" * 70)
+# По умолчанию размеры считаются последовательно — только такие цифры
+# сравнимы с Julia. BENCH_WORKERS=N включает N параллельных процессов
+# (PyPSA/pandas держат GIL): быстрее для отладки, но процессы конкурируют
+# за CPU и память, и времена получаются завышенными и несравнимыми.
+N_WORKERS = int(os.environ.get("BENCH_WORKERS", "1"))
 
-for n in DC_SIZES:
-    n_buses, lines, generators, loads = generate_network(n, seed=42)
+
+def bench_dc(n):
+    """DC PF для сети из n узлов: (n, {module: медиана в мс}, min lpf в мс, число линий)."""
+    n_buses, lines, generators, loads = NETWORKS[n]
     net = build_pypsa_network(n_buses, lines, generators, loads)
 
+    # Полный lpf (топология + B на каждом вызове) — как dc_pf_solve в Julia,
+    # именно он сравнивается с Julia в compare_benchmarks.py
     n_runs = 50 if n <= 100 else (10 if n <= 500 else 3)
     med, mn = time_median(lambda: net.lpf(), n_runs)
 
-    dc_results[n] = med * 1000
-    print(f"{n:<10} {med*1000:>12.4f} {mn*1000:>12.4f} {len(lines):>10}")
+    # Топология и B посчитаны заранее, в замере только lpf(skip_pre=True)
+    prepare_lpf(net)
+    sk_med, _ = time_median(lambda: net.lpf(skip_pre=True), n_runs)
+
+    # Тот же расчёт, что и lpf, напрямую: сборка B + splu на каждом вызове.
+    # По структуре работы аналог dc_pf_solve в Julia, но не его копия:
+    # инъекции здесь как в PyPSA (p_set генераторов), а в Julia — p_max
+    arrays = dc_pf_arrays(net)
+    sp_med, _ = time_median(lambda: dc_pf_fast(*arrays), n_runs)
+
+    # B не меняется между повторами: раскладываем один раз, замеряем только solve
+    lu_med, _ = time_median(lambda state: state[0].solve(state[1]), n_runs,
+                            setup=lambda: factorize_B(net))
+
+    # Все n_runs повторов одним lpf: n_runs снэпшотов с общей матрицей B
+    batched = build_pypsa_network(n_buses, lines, generators, loads)
+    batched.set_snapshots(pd.RangeIndex(n_runs))
+    prepare_lpf(batched)
+    bt_med, _ = time_median(lambda: batched.lpf(skip_pre=True), 3)
+    bt_med /= n_runs
 
-# ── LOPF (optimize) ─────────────────────────────────────────────
-print("\n[LOPF BENCHMARK  (linopy + HiGHS)]")
-print("-" * 70)
-print(f"{'Buses':<10} {'Median (ms)':>12} {'Min (ms)':>12} {'Lines':>10}")
-print("-" * 70)
+    # Математика lpf на готовых B и H, но без pandas-записи результатов
+    p_o = injections_o(net)
+    nw_med, _ = time_median(lambda: lpf_no_writeback(net, p_o), n_runs)
 
-for n in LOPF_SIZES:
-    n_buses, lines, generators, loads = generate_network(n, seed=42)
-    # Для LOPF нужно пересоздавать Network на каждом запуске
-    # (иначе PyPSA меняет внутреннее состояние и время нечестное)
+    # Только существенные FLOP: потоки = PTDF @ P (PTDF считается один раз)
+    pt_med, _ = time_median(lambda state: state[0] @ state[1], n_runs,
+                            setup=lambda: (ptdf_matrix(net), p_o[1:]))
 
+    times = {
+        "DC_PF":              med * 1000,
+        "DC_PF_skip_pre":     sk_med * 1000,
+        "DC_PF_sparse":       sp_med * 1000,
+        "DC_PF_lu_solve":     lu_med * 1000,
+        "DC_PF_snapshots":    bt_med * 1000,
+        "DC_PF_no_writeback": nw_med * 1000,
+        "DC_PF_ptdf":         pt_med * 1000,
+    }
+    return n, times, mn * 1000, len(lines[0])
+
+
+def bench_lopf(n):
+    """LOPF для сети из n узлов: (n, {module: медиана в мс}, min optimize в мс, число линий)."""
+    n_buses, lines, generators, loads = NETWORKS[n]
+    template = build_pypsa_network(n_buses, lines, generators, loads)
+    # Для LOPF нужна чистая Network на каждом запуске
+    # (иначе PyPSA меняет внутреннее состояние и время нечестное),
+    # поэтому оптимизируем копию шаблона, а не пересобираем сеть
+
+    # Лог решателя отключён, чтобы не засорять вывод бенчмарка
     def run_lopf():
-        net = build_pypsa_network(n_buses, lines, generators, loads)
-        net.optimize(solver_name="highs")
+        net = template.copy()
+        net.optimize(solver_name="highs", log_to_console=False)
 
     n_runs = 10 if n <= 50 else (5 if n <= 100 else 3)
     med, mn = time_median(run_lopf, n_runs)
 
-    lopf_results[n] = med * 1000
-    print(f"{n:<10} {med*1000:>12.3f} {mn*1000:>12.3f} {len(lines):>10}")
+    # Модель linopy строим один раз, замеряем только решение HiGHS
+    model = template.copy().optimize.create_model()
+    solve_med, _ = time_median(lambda: model.solve(solver_name="highs", log_to_console=False),
+                               n_runs)
+
+    # Повторное решение той же задачи с оптимального базиса (0 итераций симплекса)
+    warm_med, _ = time_median(resolve_warm, n_runs,
+                              setup=lambda: highs_warm_start(template.copy()))
+
+    times = {
+        "LOPF":       med * 1000,
+        "LOPF_solve": solve_med * 1000,
+        "LOPF_warm":  warm_med * 1000,
+    }
+    return n, times, mn * 1000, len(lines[0])
+
+
+def run_sizes(bench, sizes):
+    """bench(n) для всех размеров; результаты в порядке sizes."""
+    if N_WORKERS == 1:
+        return [bench(n) for n in sizes]
+    with ProcessPoolExecutor(max_workers=N_WORKERS) as ex:
+        return list(ex.map(bench, sizes))
+
+
+# ================================================================
+#  ОСНОВНОЙ БЕНЧМАРК
+# ================================================================
+if __name__ == "__main__":
+    print("=" * 70)
+    print("BENCHMARK: Python/PyPSA — DC Power Flow & LOPF")
+    print("=" * 70)
+    if N_WORKERS > 1:
+        print(f"[!] BENCH_WORKERS={N_WORKERS}: размеры считаются параллельно —")
+        print("    времена НЕ сравнимы с Julia и с последовательным запуском")
+
+    results = {}
+
+    # ── DC Power Flow (lpf) ─────────────────────────────────────────
+    print("\n[DC POWER FLOW BENCHMARK  (PyPSA lpf | lpf(skip_pre) | sparse LU без PyPSA"
+          " | только solve | lpf по снэпшотам | lpf без записи в *_t | raw PTDF)]")
+    print("-" * 70)
+    print(f"{'Buses':<10} {'Median (ms)':>12} {'Min (ms)':>12} {'Skip-pre (ms)':>14} "
+          f"{'Sparse (ms)':>12} "
+          f"{'Solve (ms)':>12} {'Snapshot (ms)':>14} {'No-write (ms)':>14} "
+          f"{'PTDF (ms)':>12} {'Lines':>10}")
+    print("-" * 70)
+
+    for n, times, mn, n_lines in run_sizes(bench_dc, DC_SIZES):
+        for module, ms in times.items():
+            results.setdefault(module, {})[n] = ms
+        print(f"{n:<10} {times['DC_PF']:>12.4f} {mn:>12.4f} {times['DC_PF_skip_pre']:>14.4f} "
+              f"{times['DC_PF_sparse']:>12.4f} "
+              f"{times['DC_PF_lu_solve']:>12.4f} {times['DC_PF_snapshots']:>14.4f} "
+              f"{times['DC_PF_no_writeback']:>14.4f} {times['DC_PF_ptdf']:>12.4f} {n_lines:>10}")
+
+    # ── LOPF (optimize) ─────────────────────────────────────────────
+    print("\n[LOPF BENCHMARK  (linopy + HiGHS | только model.solve | HiGHS с базиса)]")
+    print("-" * 70)
+    print(f"{'Buses':<10} {'Median (ms)':>12} {'Min (ms)':>12} {'Solve (ms)':>12} "
+          f"{'Warm (ms)':>12} {'Lines':>10}")
+    print("-" * 70)
+
+    for n, times, mn, n_lines in run_sizes(bench_lopf, LOPF_SIZES):
+        for module, ms in times.items():
+            results.setdefault(module, {})[n] = ms
+        print(f"{n:<10} {times['LOPF']:>12.3f} {mn:>12.3f} {times['LOPF_solve']:>12.3f} "
+              f"{times['LOPF_warm']:>12.3f} {n_lines:>10}")
 
-# ── Сохраняем CSV ───────────────────────────────────────────────
-with open("results/python_benchmark.csv", "w", newline="") as f:
-    writer = csv.writer(f)
-    writer.writerow(["module", "n_buses", "time_ms"])
-    for n in DC_SIZES:
-        writer.writerow(["DC_PF", n, dc_results[n]])
-    for n in LOPF_SIZES:
-        writer.writerow(["LOPF", n, lopf_results[n]])
+    # ── Сохраняем CSV ───────────────────────────────────────────────
+    with open("results/python_benchmark.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["module", "n_buses", "time_ms"])
+        for module, by_size in results.items():
+            for n, ms in by_size.items():
+                writer.writerow([module, n, ms])
 
-print("\n[OK] Results saved to results/python_benchmark.csv")
-print("Run julia/benchmark.jl to get Julia times for comparison.")
+    print("\n[OK] Results saved to results/python_benchmark.csv")
+    print("Run julia/benchmark.jl to get Julia times for comparison.")
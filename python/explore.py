@@ -44,20 +44,24 @@ print("INTERNAL MATRICES AFTER DC POWER FLOW")
 print("="*60)
 
 # Получаем sub-network (там хранятся матрицы)
-sub_network = network.sub_networks.obj[0]
+sub_network = network.sub_networks.obj.iloc[0]
 
 print("\n5. ADMITTANCE MATRIX B (susceptance):")
 if hasattr(sub_network, 'B'):
-    print(sub_network.B.toarray() if hasattr(sub_network.B, 'toarray') else sub_network.B)
+    # Только ненулевые элементы: плотная N×N матрица для больших сетей не нужна
+    B = sub_network.B.tocoo()
+    print(f"B: {B.shape}, nnz={B.nnz}")
+    for i, j, v in zip(B.row, B.col, B.data):
+        print(f"  ({i},{j}) = {v:.3f}")
 else:
     print("B matrix not directly accessible")
 
 print("\n6. POWER INJECTIONS at each bus:")
-# Генерация - нагрузка на каждом узле
-for bus in network.buses.index:
-    gen = network.generators[network.generators.bus == bus].p_nom.sum()
-    load = network.loads[network.loads.bus == bus].p_set.sum()
-    injection = gen - load
+# Генерация - нагрузка на каждом узле (одна группировка на таблицу)
+gen_by_bus = network.generators.groupby('bus').p_nom.sum().reindex(network.buses.index, fill_value=0)
+load_by_bus = network.loads.groupby('bus').p_set.sum().reindex(network.buses.index, fill_value=0)
+injection_by_bus = gen_by_bus - load_by_bus
+for bus, gen, load, injection in zip(network.buses.index, gen_by_bus, load_by_bus, injection_by_bus):
     print(f"{bus}: Gen={gen:.1f} MW, Load={load:.1f} MW, Injection={injection:.1f} MW")
 
 print("\n7. LINE SUSCEPTANCES (1/x):")
@@ -41,6 +41,11 @@ def solve_lopf(line_capacity=None, verbose=True):
     # Решение LOPF
     n.optimize(solver_name="highs")
 
+    # Результаты единственного снэпшота: по одной строке из каждой таблицы
+    p_gen  = n.generators_t.p.iloc[0]
+    p_line = n.lines_t.p0.iloc[0]
+    total_cost = float(p_gen @ n.generators.marginal_cost)
+
     if verbose:
         print("=" * 60)
         print("LOPF RESULTS (PyPSA)")
@@ -49,35 +54,25 @@ def solve_lopf(line_capacity=None, verbose=True):
         print("\n1. GENERATOR DISPATCH:")
         print(f"{'Generator':<20} {'P (MW)':>10} {'P_max (MW)':>12} {'Cost (€/MWh)':>14}")
         print("-" * 58)
-        for gen_name in n.generators.index:
-            p    = n.generators_t.p[gen_name].values[0]
-            pmax = n.generators.loc[gen_name, "p_nom"]
-            cost = n.generators.loc[gen_name, "marginal_cost"]
+        for gen_name, p, pmax, cost in zip(n.generators.index, p_gen[n.generators.index],
+                                           n.generators.p_nom, n.generators.marginal_cost):
             print(f"{gen_name:<20} {p:>10.2f} {pmax:>12.2f} {cost:>14.2f}")
 
         print("\n2. LINE FLOWS:")
         print(f"{'Line':<15} {'P (MW)':>10} {'P_max (MW)':>12} {'Loading (%)':>12}")
         print("-" * 52)
-        for line_name in n.lines.index:
-            p_flow = n.lines_t.p0[line_name].values[0]
-            s_nom_line = n.lines.loc[line_name, "s_nom"]
+        for line_name, p_flow, s_nom_line in zip(n.lines.index, p_line[n.lines.index],
+                                                 n.lines.s_nom):
             loading = abs(p_flow) / s_nom_line * 100 if s_nom_line < 1e5 else float("nan")
             print(f"{line_name:<15} {p_flow:>10.2f} "
                   f"{'∞' if s_nom_line > 1e5 else f'{s_nom_line:.1f}':>12} "
                   f"{'—' if np.isnan(loading) else f'{loading:.1f}%':>12}")
 
-        total_cost = (n.generators_t.p * n.generators.marginal_cost).sum(axis=1).sum()
         print(f"\nTotal generation cost: {total_cost:.2f} €/h")
         print("=" * 60)
 
     # Возвращаем результаты для сравнения
-    p_gen = {gen: n.generators_t.p[gen].values[0]
-             for gen in n.generators.index}
-    p_line = {line: n.lines_t.p0[line].values[0]
-              for line in n.lines.index}
-    total_cost = (n.generators_t.p * n.generators.marginal_cost).sum(axis=1).sum()
-
-    return {"p_gen": p_gen, "p_line": p_line, "total_cost": total_cost}
+    return {"p_gen": p_gen.to_dict(), "p_line": p_line.to_dict(), "total_cost": total_cost}
 
 
 if __name__ == "__main__":